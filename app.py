@@ -1,41 +1,141 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Blueprint, Response, current_app, render_template, request, jsonify
 from database import JobDatabase
-from scraper import scrape_linkedin_jobs
+from normalize import format_timestamp, normalize_country, normalize_region, parse_timestamp
+from worker import start_worker_process
 import threading
+import gzip
 import io
 import csv
-from datetime import datetime
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
 import os
 
-app = Flask(__name__)
-db = JobDatabase()
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
-# Global variable to track scraping status
-scraping_status = {
-    'is_scraping': False,
-    'progress': '',
-    'jobs_found': 0,
-    'error': None
-}
+bp = Blueprint('main', __name__)
 
-@app.route('/')
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 500
+
+# Filtered listings get their own cache entries, so bound how many are kept
+MAX_CACHE_ENTRIES = 64
+
+def create_app(db_path=None):
+    """Create the Flask app. Every worker process gets its own app backed by
+    the same database, which holds all state shared between workers."""
+    app = Flask(__name__)
+    db_path = db_path or os.environ.get('JOBS_DB_PATH', 'jobs.db')
+    
+    app.config['JOBS_DB_PATH'] = db_path
+    app.extensions['job_database'] = JobDatabase(db_path)
+    # Rendered read responses, reused until the database write counter changes
+    app.extensions['response_cache'] = {
+        'version': None,
+        'entries': {},
+        'lock': threading.Lock()
+    }
+    
+    app.register_blueprint(bp)
+    return app
+
+def get_db():
+    """Get the database for the current app"""
+    return current_app.extensions['job_database']
+
+def choose_encoding():
+    """Pick the best compression the client accepts"""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered) or 'identity'
+
+def compress_body(body, encoding):
+    """Compress a response body with the given content encoding"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+def build_response(body, encoding, mimetype, headers=None):
+    """Wrap an already encoded body in a response with its headers"""
+    response = Response(body, mimetype=mimetype)
+    if encoding != 'identity':
+        response.headers['Content-Encoding'] = encoding
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def cached_response(key, render, mimetype, headers=None):
+    """Serve a read endpoint from cache, answering 304 if the client is current.
+    
+    render() returns the uncompressed body as bytes, or None when there is
+    nothing to serve, in which case None is returned and nothing is cached.
+    """
+    cache = current_app.extensions['response_cache']
+    version = get_db().get_data_version()
+    requested = choose_encoding()
+    
+    # Without a version there's nothing safe to validate or cache against
+    if version is None:
+        body = render()
+        if body is None:
+            return None
+        encoding = requested if len(body) >= MIN_COMPRESS_SIZE else 'identity'
+        response = build_response(compress_body(body, encoding), encoding, mimetype, headers)
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    
+    etag = f'{key}-v{version}-{requested}'
+    
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        with cache['lock']:
+            if cache['version'] != version:
+                cache['entries'] = {}
+                cache['version'] = version
+            entry = cache['entries'].get((key, requested))
+        
+        if entry is None:
+            body = render()
+            if body is None:
+                return None
+            encoding = requested if len(body) >= MIN_COMPRESS_SIZE else 'identity'
+            entry = (compress_body(body, encoding), encoding)
+            with cache['lock']:
+                if cache['version'] == version:
+                    if len(cache['entries']) >= MAX_CACHE_ENTRIES:
+                        cache['entries'].pop(next(iter(cache['entries'])))
+                    cache['entries'][(key, requested)] = entry
+        
+        body, encoding = entry
+        response = build_response(body, encoding, mimetype, headers)
+    
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@bp.route('/')
 def index():
     """Main page with job scraping interface"""
-    jobs_df = db.get_all_jobs()
-    total_jobs = db.get_job_count()
+    def render():
+        db = get_db()
+        jobs_df = db.get_all_jobs()
+        total_jobs = db.get_job_count()
+        
+        return render_template('index.html', 
+                             jobs=jobs_df.to_dict('records') if not jobs_df.empty else [],
+                             total_jobs=total_jobs).encode('utf-8')
     
-    return render_template('index.html', 
-                         jobs=jobs_df.to_dict('records') if not jobs_df.empty else [],
-                         total_jobs=total_jobs)
+    return cached_response('index', render, 'text/html')
 
-@app.route('/scrape', methods=['POST'])
+@bp.route('/scrape', methods=['POST'])
 def scrape_jobs():
-    """Start scraping jobs from LinkedIn company page"""
-    global scraping_status
-    
-    if scraping_status['is_scraping']:
-        return jsonify({'error': 'Scraping already in progress'}), 400
-    
+    """Queue a scrape of a LinkedIn company page for the scrape worker"""
     company_url = request.json.get('company_url', '').strip()
     
     if not company_url:
@@ -44,101 +144,112 @@ def scrape_jobs():
     if 'linkedin.com/company' not in company_url:
         return jsonify({'error': 'Please provide a valid LinkedIn company URL'}), 400
     
-    # Start scraping in background thread
-    thread = threading.Thread(target=scrape_jobs_background, args=(company_url,))
-    thread.daemon = True
-    thread.start()
+    # The scrape worker process picks this up from the database
+    if not get_db().queue_scrape(company_url):
+        return jsonify({'error': 'Scraping already in progress'}), 400
     
     return jsonify({'message': 'Scraping started', 'status': 'started'})
 
-def scrape_jobs_background(company_url):
-    """Background function to scrape jobs"""
-    global scraping_status
-    
-    scraping_status = {
-        'is_scraping': True,
-        'progress': 'Starting scraper...',
-        'jobs_found': 0,
-        'error': None
-    }
-    
-    try:
-        scraping_status['progress'] = 'Initializing browser...'
-        
-        # Scrape jobs
-        jobs = scrape_linkedin_jobs(company_url)
-        
-        if jobs:
-            scraping_status['progress'] = f'Saving {len(jobs)} jobs to database...'
-            
-            # Save jobs to database
-            success_count = db.insert_jobs_batch(jobs)
-            
-            scraping_status = {
-                'is_scraping': False,
-                'progress': f'Successfully scraped and saved {success_count} jobs!',
-                'jobs_found': success_count,
-                'error': None
-            }
-        else:
-            scraping_status = {
-                'is_scraping': False,
-                'progress': 'No jobs found or unable to scrape jobs',
-                'jobs_found': 0,
-                'error': 'No jobs found. Please check the URL and try again.'
-            }
-    
-    except Exception as e:
-        scraping_status = {
-            'is_scraping': False,
-            'progress': 'Scraping failed',
-            'jobs_found': 0,
-            'error': f'Error: {str(e)}'
-        }
-
-@app.route('/status')
+@bp.route('/status')
 def get_status():
     """Get current scraping status"""
-    return jsonify(scraping_status)
+    return jsonify(get_db().get_scrape_status())
 
-@app.route('/jobs')
-def get_jobs():
-    """Get all jobs as JSON"""
-    jobs_df = db.get_all_jobs()
-    return jsonify(jobs_df.to_dict('records') if not jobs_df.empty else [])
+def job_filters_from_request():
+    """Read date range and location filters from the query string.
+    
+    posted_after and posted_before take ISO dates or datetimes; a bare date
+    for posted_before includes that whole day. Raises ValueError on bad dates.
+    """
+    filters = {}
+    for name in ('posted_after', 'posted_before'):
+        value = request.args.get(name, '').strip()
+        if not value:
+            continue
+        parsed = parse_timestamp(value)
+        if parsed is None:
+            raise ValueError(f'Invalid {name} date: {value}')
+        if name == 'posted_before' and len(value) == 10:
+            parsed += timedelta(days=1)
+        filters[name] = format_timestamp(parsed)
+    
+    # Match the canonical values stored at ingest, e.g. TX -> Texas, US -> United States
+    city = request.args.get('city', '').strip()
+    if city:
+        filters['city'] = city
+    region = request.args.get('region', '').strip()
+    if region:
+        filters['region'] = normalize_region(region)
+    country = request.args.get('country', '').strip()
+    if country:
+        filters['country'] = normalize_country(country) or country
+    
+    remote = request.args.get('remote', '').strip().lower()
+    if remote:
+        filters['remote'] = remote in ('1', 'true', 'yes')
+    
+    return filters
 
-@app.route('/export')
-def export_jobs():
-    """Export jobs to CSV"""
-    jobs_df = db.get_all_jobs()
+def filtered_jobs(filters):
+    """Get jobs for the given filters as a DataFrame"""
+    if filters:
+        return get_db().get_jobs_filtered(**filters)
+    return get_db().get_all_jobs()
+
+def filtered_cache_key(name, filters):
+    """Build a response cache key that distinguishes filtered listings"""
+    if not filters:
+        return name
+    return f'{name}?{urlencode(sorted(filters.items()))}'
+
+@bp.route('/jobs')
+def get_jobs():
+    """Get jobs as JSON, optionally filtered by posted date range and location"""
+    try:
+        filters = job_filters_from_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    if jobs_df.empty:
-        return jsonify({'error': 'No jobs to export'}), 400
+    def render():
+        jobs_df = filtered_jobs(filters)
+        jobs = jobs_df.to_dict('records') if not jobs_df.empty else []
+        return current_app.json.dumps(jobs).encode('utf-8')
     
-    # Create CSV in memory
-    output = io.StringIO()
-    jobs_df.to_csv(output, index=False)
-    output.seek(0)
+    return cached_response(filtered_cache_key('jobs', filters), render, 'application/json')
+
+@bp.route('/export')
+def export_jobs():
+    """Export jobs to CSV, accepting the same filters as /jobs"""
+    try:
+        filters = job_filters_from_request()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Convert to bytes
-    csv_data = io.BytesIO()
-    csv_data.write(output.getvalue().encode('utf-8'))
-    csv_data.seek(0)
+    def render():
+        jobs_df = filtered_jobs(filters)
+        
+        if jobs_df.empty:
+            return None
+        
+        # Create CSV in memory
+        output = io.StringIO()
+        jobs_df.to_csv(output, index=False)
+        return output.getvalue().encode('utf-8')
     
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filename = f'linkedin_jobs_{timestamp}.csv'
     
-    return send_file(
-        csv_data,
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=filename
-    )
+    response = cached_response(filtered_cache_key('export', filters), render, 'text/csv', headers={
+        'Content-Disposition': f'attachment; filename={filename}'
+    })
+    if response is None:
+        return jsonify({'error': 'No jobs to export'}), 400
+    return response
 
-@app.route('/clear')
+@bp.route('/clear')
 def clear_jobs():
     """Clear all jobs from database"""
-    success = db.delete_all_jobs()
+    success = get_db().delete_all_jobs()
     if success:
         return jsonify({'message': 'All jobs cleared successfully'})
     else:
@@ -149,4 +260,10 @@ if __name__ == '__main__':
     if not os.path.exists('templates'):
         os.makedirs('templates')
     
-    app.run(debug=True, host='0.0.0.0', port=5009)
\ No newline at end of file
+    app = create_app()
+    
+    # Start the scrape worker once, not again in the reloader's child process
+    if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+        start_worker_process(app.config['JOBS_DB_PATH'])
+    
+    app.run(debug=True, host='0.0.0.0', port=5009)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Headless batch scraper for LinkedIn Job Scraper
+
+Reads LinkedIn company URLs from a file or stdin, scrapes them concurrently in
+worker processes and streams the results to the database and/or NDJSON.
+Completed companies are recorded in a checkpoint file, so an interrupted run
+resumes where it stopped.
+
+Example:
+    python batch.py companies.txt --concurrency 4 --ndjson jobs.ndjson
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from database import JobDatabase
+from scraper import LinkedInJobScraper
+
+class BatchStats:
+    """Counters for the end of run throughput summary"""
+    def __init__(self):
+        self.started = time.time()
+        self.companies_done = 0
+        self.companies_skipped = 0
+        self.companies_empty = 0
+        self.failures = 0
+        self.jobs = 0
+        self.pages = 0
+    
+    def summary(self):
+        elapsed = max(time.time() - self.started, 1e-9)
+        return (
+            f"Companies: {self.companies_done} done, {self.companies_empty} with no jobs, "
+            f"{self.companies_skipped} skipped, {self.failures} failed\n"
+            f"Jobs: {self.jobs}  Pages: {self.pages}  Elapsed: {elapsed:.1f}s\n"
+            f"Throughput: {self.pages / elapsed:.2f} pages/s, {self.jobs / elapsed:.2f} jobs/s"
+        )
+
+def read_company_urls(source):
+    """Yield company URLs from a file object, ignoring blank lines and # comments"""
+    for line in source:
+        url = line.strip()
+        if url and not url.startswith('#'):
+            yield url
+
+def load_checkpoint(path):
+    """Get the set of company URLs completed in earlier runs.
+    
+    Each checkpoint line is "<status>\t<url>", where status is done or empty.
+    """
+    completed = set()
+    if not path or not os.path.exists(path):
+        return completed
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            url = line.strip().rpartition('\t')[2]
+            if url:
+                completed.add(url)
+    return completed
+
+def init_scrape_process():
+    """Send scraper output in worker processes to stderr, keeping stdout for NDJSON"""
+    sys.stdout = sys.stderr
+
+def scrape_company(company_url):
+    """Scrape one company in a worker process. Returns (jobs, pages fetched, fetch errors).
+    
+    Scraping runs in the process's main thread, which the browser used for
+    JS rendering requires, and the scraper is closed like in the web worker.
+    """
+    with LinkedInJobScraper() as scraper:
+        jobs = scraper.scrape_company_jobs(company_url)
+        return jobs, scraper.pages_fetched, scraper.fetch_errors
+
+def run_batch(company_urls, db=None, ndjson_file=None, checkpoint_path=None, concurrency=4,
+              stats=None):
+    """Scrape companies concurrently, saving results and checkpointing as each completes.
+    
+    Results are written from this process only, so the database sees a single
+    writer. A company is checkpointed after its jobs are saved, or as empty if
+    its pages loaded but had no jobs. Companies that raised, hit fetch errors
+    or failed to save are left out so the next run retries them.
+    """
+    stats = stats or BatchStats()
+    completed = load_checkpoint(checkpoint_path)
+    checkpoint_file = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    
+    def write_checkpoint(company_url, status):
+        if checkpoint_file is not None:
+            checkpoint_file.write(f"{status}\t{company_url}\n")
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+    
+    def handle_result(company_url, future):
+        try:
+            jobs, pages, fetch_errors = future.result()
+        except Exception as e:
+            stats.failures += 1
+            print(f"❌ {company_url}: {e}", file=sys.stderr)
+            return
+        
+        stats.pages += pages
+        if not jobs:
+            if fetch_errors or not pages:
+                stats.failures += 1
+                print(f"❌ {company_url}: failed to fetch job pages", file=sys.stderr)
+            else:
+                write_checkpoint(company_url, 'empty')
+                stats.companies_empty += 1
+                print(f"⚠️ {company_url}: no jobs found", file=sys.stderr)
+            return
+        
+        saved = len(jobs)
+        if db is not None:
+            saved = db.insert_jobs_batch(jobs)
+            if saved < len(jobs):
+                stats.failures += 1
+                print(f"❌ {company_url}: failed to save jobs to the database", file=sys.stderr)
+                return
+        if ndjson_file is not None:
+            for job in jobs:
+                ndjson_file.write(json.dumps(job) + '\n')
+            ndjson_file.flush()
+        
+        write_checkpoint(company_url, 'done')
+        stats.companies_done += 1
+        stats.jobs += saved
+        print(f"✅ {company_url}: {saved} jobs", file=sys.stderr)
+    
+    executor = ProcessPoolExecutor(max_workers=concurrency, initializer=init_scrape_process)
+    pending = {}
+    try:
+        for company_url in company_urls:
+            if company_url in completed:
+                stats.companies_skipped += 1
+                continue
+            if 'linkedin.com/company' not in company_url:
+                stats.failures += 1
+                print(f"❌ {company_url}: not a LinkedIn company URL", file=sys.stderr)
+                continue
+            completed.add(company_url)
+            
+            # Keep only a small window in flight so huge inputs stream through
+            while len(pending) >= concurrency * 2:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    handle_result(pending.pop(future), future)
+            
+            pending[executor.submit(scrape_company, company_url)] = company_url
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                handle_result(pending.pop(future), future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if checkpoint_file is not None:
+            checkpoint_file.close()
+    
+    return stats
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape LinkedIn company job pages in batch')
+    parser.add_argument('input', nargs='?', default='-',
+                        help='File with one company URL per line, or - for stdin (default)')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Number of worker processes scraping companies at once')
+    parser.add_argument('--db', default=os.environ.get('JOBS_DB_PATH', 'jobs.db'),
+                        help='Path to the SQLite database')
+    parser.add_argument('--no-db', action='store_true',
+                        help='Do not save jobs to the database')
+    parser.add_argument('--ndjson',
+                        help='Also write jobs as NDJSON to this file, or - for stdout')
+    parser.add_argument('--checkpoint', default='batch.checkpoint',
+                        help='File recording completed companies, used to resume')
+    args = parser.parse_args()
+    
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+    if args.no_db and not args.ndjson:
+        parser.error('--no-db requires --ndjson, otherwise results would be discarded')
+    
+    db = None if args.no_db else JobDatabase(args.db)
+    source = sys.stdin if args.input == '-' else open(args.input, encoding='utf-8')
+    if args.ndjson == '-':
+        ndjson_file = sys.stdout
+    elif args.ndjson:
+        ndjson_file = open(args.ndjson, 'a', encoding='utf-8')
+    else:
+        ndjson_file = None
+    
+    # The scraper prints progress to stdout; keep stdout clean for NDJSON
+    stats = BatchStats()
+    exit_code = 0
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            run_batch(read_company_urls(source), db, ndjson_file,
+                      args.checkpoint, args.concurrency, stats)
+    except KeyboardInterrupt:
+        print("\n🛑 Interrupted, rerun the same command to resume", file=sys.stderr)
+        exit_code = 130
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if ndjson_file is not None and ndjson_file is not sys.stdout:
+            ndjson_file.close()
+    
+    print("=" * 50, file=sys.stderr)
+    print(stats.summary(), file=sys.stderr)
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
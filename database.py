@@ -1,18 +1,53 @@
 import sqlite3
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 import os
+from normalize import format_timestamp, parse_location, parse_posted_date
 
 class JobDatabase:
+    # Columns derived from posted_date and job_location at insert time
+    NORMALIZED_COLUMNS = [
+        ('posted_at', 'TEXT'),
+        ('location_city', 'TEXT COLLATE NOCASE'),
+        ('location_region', 'TEXT COLLATE NOCASE'),
+        ('location_country', 'TEXT COLLATE NOCASE'),
+        ('is_remote', 'INTEGER NOT NULL DEFAULT 0'),
+        ('normalized', 'INTEGER NOT NULL DEFAULT 0')
+    ]
+    
+    # Columns returned by job listings, leaving out internal bookkeeping
+    JOB_COLUMNS = ', '.join([
+        'id', 'company_name', 'job_title', 'job_location', 'job_type', 'job_description',
+        'job_url', 'posted_date', 'scraped_date', 'salary_range', 'experience_level',
+        'department', 'posted_at', 'location_city', 'location_region', 'location_country',
+        'is_remote'
+    ])
+    
+    # A running scrape whose worker hasn't sent a heartbeat for this long is
+    # treated as dead, and a queued scrape no worker claimed as abandoned
+    RUNNING_STALE_SECONDS = 120
+    QUEUED_STALE_SECONDS = 60
+    
     def __init__(self, db_path="jobs.db"):
         self.db_path = db_path
         self.init_database()
     
+    def _connect(self):
+        """Open a connection that waits for locks held by other processes"""
+        return sqlite3.connect(self.db_path, timeout=30)
+    
     def init_database(self):
         """Initialize the database with the jobs table"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
+        # WAL lets web workers keep reading while the scrape worker writes
+        cursor.execute("PRAGMA journal_mode=WAL")
+        
+        # Hold the write lock for the whole setup, so web workers starting at
+        # the same time don't race on the schema migration below
+        cursor.execute("BEGIN IMMEDIATE")
+        
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS jobs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -26,57 +61,200 @@ class JobDatabase:
                 scraped_date TEXT DEFAULT CURRENT_TIMESTAMP,
                 salary_range TEXT,
                 experience_level TEXT,
-                department TEXT
+                department TEXT,
+                posted_at TEXT,
+                location_city TEXT COLLATE NOCASE,
+                location_region TEXT COLLATE NOCASE,
+                location_country TEXT COLLATE NOCASE,
+                is_remote INTEGER NOT NULL DEFAULT 0,
+                normalized INTEGER NOT NULL DEFAULT 0
             )
         ''')
         
+        # Add normalized columns to databases created before they existed
+        cursor.execute("PRAGMA table_info(jobs)")
+        existing_columns = {row[1] for row in cursor.fetchall()}
+        for name, column_type in self.NORMALIZED_COLUMNS:
+            if name not in existing_columns:
+                cursor.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs (posted_at)")
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_jobs_location
+            ON jobs (location_country, location_region, location_city)
+        ''')
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_location_region ON jobs (location_region, location_city)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_location_city ON jobs (location_city)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_is_remote ON jobs (is_remote, posted_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_normalized ON jobs (normalized)")
+        
+        # Write counter used by the web app to detect changes cheaply
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS db_meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)")
+        
+        # Single-row scrape state shared by all web workers and the scrape worker.
+        # state is 'idle', 'queued' (waiting for the worker) or 'running'.
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS scrape_status (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                state TEXT NOT NULL DEFAULT 'idle',
+                company_url TEXT,
+                progress TEXT DEFAULT '',
+                jobs_found INTEGER DEFAULT 0,
+                error TEXT,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO scrape_status (id) VALUES (1)")
+        
         conn.commit()
         conn.close()
     
+    def _normalize_job(self, posted_date, job_location, scraped_date):
+        """Compute the normalized column values for a job"""
+        location = parse_location(job_location)
+        return (
+            parse_posted_date(posted_date, scraped_date),
+            location['city'],
+            location['region'],
+            location['country'],
+            location['is_remote']
+        )
+    
+    def backfill_normalized_fields(self, batch_size=500):
+        """Fill normalized columns for rows inserted before they existed, in batches.
+        
+        Run once per deployment by the scrape worker rather than on every
+        connection, so web workers don't repeat the work at startup.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        updated = 0
+        try:
+            last_id = 0
+            while True:
+                cursor.execute('''
+                    SELECT id, posted_date, job_location, scraped_date FROM jobs
+                    WHERE normalized = 0 AND id > ? ORDER BY id LIMIT ?
+                ''', (last_id, batch_size))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                
+                cursor.executemany('''
+                    UPDATE jobs
+                    SET posted_at = ?, location_city = ?, location_region = ?,
+                        location_country = ?, is_remote = ?, normalized = 1
+                    WHERE id = ?
+                ''', [
+                    self._normalize_job(posted_date, job_location, scraped_date) + (job_id,)
+                    for job_id, posted_date, job_location, scraped_date in rows
+                ])
+                self._bump_data_version(cursor)
+                conn.commit()
+                
+                updated += len(rows)
+                last_id = rows[-1][0]
+            
+            if updated:
+                print(f"Backfilled normalized fields for {updated} jobs")
+            return updated
+        except sqlite3.Error as e:
+            print(f"Error backfilling normalized fields: {e}")
+            return updated
+        finally:
+            conn.close()
+    
+    def _bump_data_version(self, cursor):
+        """Increment the write counter inside the caller's transaction"""
+        cursor.execute("UPDATE db_meta SET value = value + 1 WHERE key = 'data_version'")
+    
+    def get_data_version(self):
+        """Get the write counter, which changes whenever jobs are modified.
+        
+        Returns None if it can't be read, so callers don't mistake a failure
+        for an unchanged database.
+        """
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT value FROM db_meta WHERE key = 'data_version'")
+            row = cursor.fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"Error getting data version: {e}")
+            return None
+        finally:
+            conn.close()
+    
+    def _job_row(self, job_data, scraped_date):
+        """Build the insert parameters for a job, including its normalized fields"""
+        normalized = self._normalize_job(
+            job_data.get('posted_date', ''),
+            job_data.get('job_location', ''),
+            scraped_date
+        )
+        return (
+            job_data.get('company_name', ''),
+            job_data.get('job_title', ''),
+            job_data.get('job_location', ''),
+            job_data.get('job_type', ''),
+            job_data.get('job_description', ''),
+            job_data.get('job_url', ''),
+            job_data.get('posted_date', ''),
+            job_data.get('salary_range', ''),
+            job_data.get('experience_level', ''),
+            job_data.get('department', ''),
+            scraped_date
+        ) + normalized
+    
     def insert_job(self, job_data):
         """Insert a single job into the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        return self.insert_jobs_batch([job_data]) == 1
+    
+    def insert_jobs_batch(self, jobs_list):
+        """Insert multiple jobs into the database in a single transaction.
+        
+        Returns the number of jobs saved: all of them, or 0 if the batch
+        failed and was rolled back.
+        """
+        if not jobs_list:
+            return 0
         
+        # Relative posted dates are anchored to the scraped date stored with the rows
+        scraped_date = format_timestamp(datetime.now(timezone.utc))
+        
+        conn = self._connect()
+        cursor = conn.cursor()
         try:
-            cursor.execute('''
+            cursor.executemany('''
                 INSERT OR REPLACE INTO jobs 
                 (company_name, job_title, job_location, job_type, job_description, 
-                 job_url, posted_date, salary_range, experience_level, department)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                job_data.get('company_name', ''),
-                job_data.get('job_title', ''),
-                job_data.get('job_location', ''),
-                job_data.get('job_type', ''),
-                job_data.get('job_description', ''),
-                job_data.get('job_url', ''),
-                job_data.get('posted_date', ''),
-                job_data.get('salary_range', ''),
-                job_data.get('experience_level', ''),
-                job_data.get('department', '')
-            ))
+                 job_url, posted_date, salary_range, experience_level, department,
+                 scraped_date, posted_at, location_city, location_region, location_country,
+                 is_remote, normalized)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+            ''', [self._job_row(job, scraped_date) for job in jobs_list])
+            self._bump_data_version(cursor)
             conn.commit()
-            return True
+            return len(jobs_list)
         except sqlite3.Error as e:
+            conn.rollback()
             print(f"Database error: {e}")
-            return False
+            return 0
         finally:
             conn.close()
     
-    def insert_jobs_batch(self, jobs_list):
-        """Insert multiple jobs into the database"""
-        success_count = 0
-        for job in jobs_list:
-            if self.insert_job(job):
-                success_count += 1
-        return success_count
-    
     def get_all_jobs(self):
         """Get all jobs from the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
-            df = pd.read_sql_query("SELECT * FROM jobs ORDER BY scraped_date DESC", conn)
+            df = pd.read_sql_query(f"SELECT {self.JOB_COLUMNS} FROM jobs ORDER BY scraped_date DESC", conn)
             return df
         except Exception as e:
             print(f"Error fetching jobs: {e}")
@@ -86,10 +264,10 @@ class JobDatabase:
     
     def get_jobs_by_company(self, company_name):
         """Get jobs for a specific company"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             df = pd.read_sql_query(
-                "SELECT * FROM jobs WHERE company_name LIKE ? ORDER BY scraped_date DESC", 
+                f"SELECT {self.JOB_COLUMNS} FROM jobs WHERE company_name LIKE ? ORDER BY scraped_date DESC", 
                 conn, 
                 params=[f"%{company_name}%"]
             )
@@ -100,12 +278,53 @@ class JobDatabase:
         finally:
             conn.close()
     
+    def get_jobs_filtered(self, posted_after=None, posted_before=None, city=None,
+                          region=None, country=None, remote=None):
+        """Get jobs matching date range and location filters using the normalized columns.
+        
+        posted_after and posted_before are timestamp strings compared against
+        posted_at (after is inclusive, before is exclusive). Location filters
+        match case-insensitively; remote is True or False.
+        """
+        conditions = []
+        params = []
+        if posted_after:
+            conditions.append("posted_at >= ?")
+            params.append(posted_after)
+        if posted_before:
+            conditions.append("posted_at < ?")
+            params.append(posted_before)
+        for column, value in (('location_city', city), ('location_region', region),
+                              ('location_country', country)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if remote is not None:
+            conditions.append("is_remote = ?")
+            params.append(1 if remote else 0)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        conn = self._connect()
+        try:
+            df = pd.read_sql_query(
+                f"SELECT {self.JOB_COLUMNS} FROM jobs {where} ORDER BY scraped_date DESC",
+                conn,
+                params=params
+            )
+            return df
+        except Exception as e:
+            print(f"Error fetching filtered jobs: {e}")
+            return pd.DataFrame()
+        finally:
+            conn.close()
+    
     def delete_all_jobs(self):
         """Delete all jobs from the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         try:
             cursor.execute("DELETE FROM jobs")
+            self._bump_data_version(cursor)
             conn.commit()
             return True
         except sqlite3.Error as e:
@@ -116,7 +335,7 @@ class JobDatabase:
     
     def get_job_count(self):
         """Get total number of jobs in database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         try:
             cursor.execute("SELECT COUNT(*) FROM jobs")
@@ -126,4 +345,139 @@ class JobDatabase:
             print(f"Error getting job count: {e}")
             return 0
         finally:
-            conn.close()
\ No newline at end of file
+            conn.close()
+    
+    def get_scrape_status(self):
+        """Get the current scraping status"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            if self._release_stale_scrape(cursor):
+                conn.commit()
+            cursor.execute("SELECT state, progress, jobs_found, error FROM scrape_status WHERE id = 1")
+            state, progress, jobs_found, error = cursor.fetchone()
+            return {
+                'is_scraping': state != 'idle',
+                'progress': progress or '',
+                'jobs_found': jobs_found or 0,
+                'error': error
+            }
+        except sqlite3.Error as e:
+            print(f"Error getting scrape status: {e}")
+            return {'is_scraping': False, 'progress': '', 'jobs_found': 0, 'error': None}
+        finally:
+            conn.close()
+    
+    def queue_scrape(self, company_url):
+        """Queue a scrape for the worker. Returns False if one is already in progress"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            self._release_stale_scrape(cursor)
+            cursor.execute('''
+                UPDATE scrape_status
+                SET state = 'queued', company_url = ?, progress = 'Waiting for scrape worker...',
+                    jobs_found = 0, error = NULL, updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1 AND state = 'idle'
+            ''', (company_url,))
+            conn.commit()
+            return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            print(f"Error queueing scrape: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def claim_queued_scrape(self):
+        """Mark a queued scrape as running and return its URL, or None if nothing is queued"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                UPDATE scrape_status
+                SET state = 'running', progress = 'Starting scraper...', updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1 AND state = 'queued'
+            ''')
+            if cursor.rowcount != 1:
+                conn.rollback()
+                return None
+            cursor.execute("SELECT company_url FROM scrape_status WHERE id = 1")
+            company_url = cursor.fetchone()[0]
+            conn.commit()
+            return company_url
+        except sqlite3.Error as e:
+            print(f"Error claiming scrape: {e}")
+            return None
+        finally:
+            conn.close()
+    
+    def update_scrape_status(self, state=None, progress=None, jobs_found=None, error=None):
+        """Update the scraping status, leaving fields passed as None unchanged"""
+        fields = {'state': state, 'progress': progress, 'jobs_found': jobs_found, 'error': error}
+        updates = {name: value for name, value in fields.items() if value is not None}
+        
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            assignments = ', '.join(f"{name} = ?" for name in updates)
+            cursor.execute(
+                f"UPDATE scrape_status SET {assignments}, updated_at = CURRENT_TIMESTAMP WHERE id = 1",
+                list(updates.values())
+            )
+            conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error updating scrape status: {e}")
+            return False
+        finally:
+            conn.close()
+    
+    def heartbeat_scrape(self):
+        """Mark the running scrape as still alive"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute('''
+                UPDATE scrape_status SET updated_at = CURRENT_TIMESTAMP
+                WHERE id = 1 AND state = 'running'
+            ''')
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error updating scrape heartbeat: {e}")
+        finally:
+            conn.close()
+    
+    def _release_stale_scrape(self, cursor):
+        """Return a stuck scrape to idle inside the caller's transaction.
+        
+        A running scrape is stuck once its worker stops sending heartbeats,
+        and a queued one once no worker has claimed it in time. Returns True
+        if a scrape was released.
+        """
+        cursor.execute('''
+            UPDATE scrape_status
+            SET state = 'idle', progress = 'Scraping failed',
+                error = 'Scraping was interrupted. Please try again.', updated_at = CURRENT_TIMESTAMP
+            WHERE id = 1 AND state = 'running' AND updated_at < datetime('now', ?)
+        ''', (f'-{self.RUNNING_STALE_SECONDS} seconds',))
+        released = cursor.rowcount
+        cursor.execute('''
+            UPDATE scrape_status
+            SET state = 'idle', progress = 'Scraping failed',
+                error = 'No scrape worker picked up the request. Is worker.py running?',
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = 1 AND state = 'queued' AND updated_at < datetime('now', ?)
+        ''', (f'-{self.QUEUED_STALE_SECONDS} seconds',))
+        return released + cursor.rowcount > 0
+    
+    def release_stale_scrape(self):
+        """Release a scrape left stuck by a worker that exited or never ran"""
+        conn = self._connect()
+        cursor = conn.cursor()
+        try:
+            self._release_stale_scrape(cursor)
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"Error resetting scrape status: {e}")
+        finally:
+            conn.close()
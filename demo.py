@@ -40,6 +40,9 @@ def demo_scraper():
     print("  or")
     print("  python run.py")
     
+    print("\n📦 To scrape a list of companies from the command line:")
+    print("  python batch.py companies.txt --concurrency 4")
+    
     # Test database functionality
     print("\n🧪 Testing database functionality...")
     
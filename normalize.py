@@ -0,0 +1,162 @@
+"""
+Normalization of scraped posting dates and locations into queryable fields
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+# Format shared with SQLite's CURRENT_TIMESTAMP so stored times compare as text
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+RELATIVE_UNITS = {
+    'second': timedelta(seconds=1),
+    'minute': timedelta(minutes=1),
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=30),
+    'year': timedelta(days=365),
+}
+
+RELATIVE_PATTERN = re.compile(
+    r'\b(\d+|an?|one)\+?\s*(second|minute|hour|day|week|month|year|sec|min|hr|mo|yr)s?\b\s+ago'
+)
+
+UNIT_ALIASES = {'sec': 'second', 'min': 'minute', 'hr': 'hour', 'mo': 'month', 'yr': 'year'}
+
+US_STATES = {
+    'AL': 'Alabama', 'AK': 'Alaska', 'AZ': 'Arizona', 'AR': 'Arkansas', 'CA': 'California',
+    'CO': 'Colorado', 'CT': 'Connecticut', 'DE': 'Delaware', 'FL': 'Florida', 'GA': 'Georgia',
+    'HI': 'Hawaii', 'ID': 'Idaho', 'IL': 'Illinois', 'IN': 'Indiana', 'IA': 'Iowa',
+    'KS': 'Kansas', 'KY': 'Kentucky', 'LA': 'Louisiana', 'ME': 'Maine', 'MD': 'Maryland',
+    'MA': 'Massachusetts', 'MI': 'Michigan', 'MN': 'Minnesota', 'MS': 'Mississippi',
+    'MO': 'Missouri', 'MT': 'Montana', 'NE': 'Nebraska', 'NV': 'Nevada', 'NH': 'New Hampshire',
+    'NJ': 'New Jersey', 'NM': 'New Mexico', 'NY': 'New York', 'NC': 'North Carolina',
+    'ND': 'North Dakota', 'OH': 'Ohio', 'OK': 'Oklahoma', 'OR': 'Oregon', 'PA': 'Pennsylvania',
+    'RI': 'Rhode Island', 'SC': 'South Carolina', 'SD': 'South Dakota', 'TN': 'Tennessee',
+    'TX': 'Texas', 'UT': 'Utah', 'VT': 'Vermont', 'VA': 'Virginia', 'WA': 'Washington',
+    'WV': 'West Virginia', 'WI': 'Wisconsin', 'WY': 'Wyoming', 'DC': 'District of Columbia',
+}
+
+STATE_NAMES = {name.lower(): name for name in US_STATES.values()}
+
+COUNTRY_ALIASES = {
+    'us': 'United States', 'usa': 'United States', 'united states of america': 'United States',
+    'uk': 'United Kingdom', 'england': 'United Kingdom', 'scotland': 'United Kingdom',
+    'wales': 'United Kingdom', 'northern ireland': 'United Kingdom',
+}
+
+KNOWN_COUNTRIES = {
+    'United States', 'United Kingdom', 'Canada', 'Mexico', 'Brazil', 'Argentina', 'Ireland',
+    'France', 'Germany', 'Spain', 'Portugal', 'Italy', 'Netherlands', 'Belgium', 'Switzerland',
+    'Austria', 'Sweden', 'Norway', 'Denmark', 'Finland', 'Poland', 'Czechia', 'Romania',
+    'India', 'China', 'Japan', 'South Korea', 'Singapore', 'Australia', 'New Zealand',
+    'Israel', 'United Arab Emirates', 'South Africa', 'Philippines', 'Vietnam', 'Indonesia',
+}
+
+COUNTRY_NAMES = {name.lower(): name for name in KNOWN_COUNTRIES}
+
+# Work arrangement markers stripped from the place name
+ARRANGEMENT_PATTERN = re.compile(r'\((remote|hybrid|on-site|onsite)\)|\b(remote|hybrid|on-site|onsite)\b', re.I)
+
+# Separators left behind once a marker is removed, as in "Remote - US"
+SEPARATOR_CHARS = ' -–—|/'
+
+AREA_PATTERN = re.compile(r'^(greater\s+)?(.+?)(\s+metropolitan|\s+metro|\s+bay)?\s+area$', re.I)
+
+def format_timestamp(value):
+    """Format a datetime as a naive UTC timestamp string"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime(TIMESTAMP_FORMAT)
+
+def parse_timestamp(text):
+    """Parse an ISO date or datetime string, returning None if it isn't one"""
+    try:
+        return datetime.fromisoformat(text.strip().replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return None
+
+def parse_posted_date(posted_date, scraped_at=None):
+    """Convert a posted date into a UTC timestamp string.
+    
+    Handles ISO dates from a card's datetime attribute as well as relative
+    text like "2 weeks ago", which is anchored to scraped_at (a datetime or
+    timestamp string, defaulting to now). Returns None if it can't be parsed.
+    """
+    if not posted_date:
+        return None
+    
+    parsed = parse_timestamp(posted_date)
+    if parsed is not None:
+        return format_timestamp(parsed)
+    
+    if isinstance(scraped_at, str):
+        scraped_at = parse_timestamp(scraped_at)
+    if scraped_at is None:
+        scraped_at = datetime.now(timezone.utc)
+    
+    text = posted_date.strip().lower()
+    if text in ('just now', 'today', 'new'):
+        return format_timestamp(scraped_at)
+    if text == 'yesterday':
+        return format_timestamp(scraped_at - timedelta(days=1))
+    
+    match = RELATIVE_PATTERN.search(text)
+    if not match:
+        return None
+    
+    amount, unit = match.groups()
+    amount = int(amount) if amount.isdigit() else 1
+    unit = UNIT_ALIASES.get(unit, unit)
+    return format_timestamp(scraped_at - amount * RELATIVE_UNITS[unit])
+
+def normalize_country(name):
+    """Return the canonical country name, or None if it isn't a known country"""
+    key = name.lower()
+    return COUNTRY_ALIASES.get(key) or COUNTRY_NAMES.get(key)
+
+def normalize_region(name):
+    """Expand US state codes and tidy state names"""
+    return US_STATES.get(name.upper()) or STATE_NAMES.get(name.lower()) or name
+
+def parse_location(job_location):
+    """Split a free text location into city, region, country and remote fields"""
+    location = {'city': None, 'region': None, 'country': None, 'is_remote': 0}
+    if not job_location or job_location.strip().lower() == 'not specified':
+        return location
+    
+    if re.search(r'\bremote\b', job_location, re.I):
+        location['is_remote'] = 1
+    
+    place = ARRANGEMENT_PATTERN.sub('', job_location)
+    parts = [part.strip(SEPARATOR_CHARS) for part in place.split(',')]
+    parts = [part for part in parts if part]
+    
+    if len(parts) >= 3:
+        location['city'] = parts[0]
+        location['region'] = normalize_region(parts[-2])
+        location['country'] = normalize_country(parts[-1]) or parts[-1]
+    elif len(parts) == 2:
+        location['city'] = parts[0]
+        country = normalize_country(parts[1])
+        if country:
+            location['country'] = country
+        elif parts[1].upper() in US_STATES or parts[1].lower() in STATE_NAMES:
+            location['region'] = normalize_region(parts[1])
+            location['country'] = 'United States'
+        else:
+            location['region'] = parts[1]
+    elif len(parts) == 1:
+        place = parts[0]
+        country = normalize_country(place)
+        if country:
+            location['country'] = country
+        elif place.upper() in US_STATES or place.lower() in STATE_NAMES:
+            location['region'] = normalize_region(place)
+            location['country'] = 'United States'
+        else:
+            area = AREA_PATTERN.match(place)
+            location['city'] = area.group(2) if area else place
+    
+    return location
@@ -3,10 +3,42 @@
 Simple runner script for LinkedIn Job Scraper
 """
 
+import argparse
+import multiprocessing
 import os
+import subprocess
 import sys
 
+def run_production(port, workers, db_path):
+    """Serve the app with multiple gunicorn workers"""
+    print(f"\n🌐 Starting gunicorn with {workers} workers...")
+    print(f"📍 Open your browser and go to: http://localhost:{port}")
+    print("🛑 Press Ctrl+C to stop the server")
+    print("=" * 50)
+    
+    env = dict(os.environ, JOBS_DB_PATH=db_path)
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '--workers', str(workers),
+        '--bind', f'0.0.0.0:{port}',
+        'app:create_app()'
+    ]
+    try:
+        return subprocess.call(command, env=env)
+    except KeyboardInterrupt:
+        return 0
+
 def main():
+    parser = argparse.ArgumentParser(description='Run the LinkedIn Job Scraper web app')
+    parser.add_argument('--production', action='store_true',
+                        help='Serve with multiple gunicorn workers instead of the debug server')
+    parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count() * 2 + 1,
+                        help='Number of web workers in production mode')
+    parser.add_argument('--port', type=int, default=5009, help='Port to listen on')
+    parser.add_argument('--db', default=os.environ.get('JOBS_DB_PATH', 'jobs.db'),
+                        help='Path to the SQLite database')
+    args = parser.parse_args()
+    
     print("🚀 Starting LinkedIn Job Scraper...")
     print("=" * 50)
     
@@ -17,14 +49,26 @@ def main():
     
     # Import and run the Flask app
     try:
-        from app import app
+        from app import create_app
+        from worker import start_worker_process
+        app = create_app(args.db)
         print("✅ Application loaded successfully")
+        
+        if args.production:
+            start_worker_process(args.db)
+            print("✅ Scrape worker started")
+            sys.exit(run_production(args.port, args.workers, args.db))
+        
+        # Start the scrape worker once, not again in the reloader's child process
+        if os.environ.get('WERKZEUG_RUN_MAIN') != 'true':
+            start_worker_process(args.db)
+        
         print("\n🌐 Starting web server...")
-        print("📍 Open your browser and go to: http://localhost:5009")
+        print(f"📍 Open your browser and go to: http://localhost:{args.port}")
         print("🛑 Press Ctrl+C to stop the server")
         print("=" * 50)
         
-        app.run(debug=True, host='0.0.0.0', port=5009)
+        app.run(debug=True, host='0.0.0.0', port=args.port)
         
     except ImportError as e:
         print(f"❌ Import error: {e}")
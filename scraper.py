@@ -21,6 +21,8 @@ from requests_html import HTMLSession
 class LinkedInJobScraper:
     def __init__(self):
         self.session = HTMLSession()
+        self.pages_fetched = 0
+        self.fetch_errors = 0
         self.setup_session()
     
     def setup_session(self):
@@ -53,6 +55,7 @@ class LinkedInJobScraper:
             print(f"Fetching: {url}")
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
+            self.pages_fetched += 1
             
             # For JavaScript-heavy pages, we might need to render
             try:
@@ -64,6 +67,7 @@ class LinkedInJobScraper:
             return response.html.html
         except requests.RequestException as e:
             print(f"Error fetching page: {e}")
+            self.fetch_errors += 1
             return None
     
     def parse_job_from_element(self, job_element, company_name, base_url):
@@ -0,0 +1,95 @@
+"""
+Tests for batch scraping checkpoint and resume
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('requests_html')
+
+import batch
+
+COMPANY = 'https://www.linkedin.com/company/{}/jobs/'
+
+def fake_scrape_company(company_url):
+    """Stand-in for scrape_company, keyed on the company slug"""
+    if 'boom' in company_url:
+        raise RuntimeError('scraper crashed')
+    if 'fetchfail' in company_url:
+        return [], 1, 1
+    if 'empty' in company_url:
+        return [], 2, 0
+    return [{'company_name': company_url, 'job_title': 'Engineer', 'job_url': company_url + '1'}], 2, 0
+
+class FakeDatabase:
+    def __init__(self, saved=None):
+        self.saved = saved
+        self.inserted = []
+    
+    def insert_jobs_batch(self, jobs):
+        self.inserted.extend(jobs)
+        return len(jobs) if self.saved is None else self.saved
+
+@pytest.fixture(autouse=True)
+def run_in_threads(monkeypatch):
+    # Threads see the stubbed scrape_company; worker processes might not
+    monkeypatch.setattr(batch, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setattr(batch, 'init_scrape_process', lambda: None)
+    monkeypatch.setattr(batch, 'scrape_company', fake_scrape_company)
+
+def read_checkpoint(path):
+    return sorted(path.read_text(encoding='utf-8').splitlines())
+
+def test_run_batch_checkpoints_done_and_empty(tmp_path):
+    checkpoint = tmp_path / 'batch.checkpoint'
+    urls = [COMPANY.format(name) for name in ('acme', 'empty', 'fetchfail', 'boom')]
+    urls.append('https://www.linkedin.com/jobs/view/123')
+    
+    stats = batch.run_batch(iter(urls), FakeDatabase(), checkpoint_path=str(checkpoint),
+                            concurrency=2)
+    
+    assert (stats.companies_done, stats.companies_empty, stats.failures) == (1, 1, 3)
+    assert stats.jobs == 1
+    assert read_checkpoint(checkpoint) == [
+        f"done\t{COMPANY.format('acme')}",
+        f"empty\t{COMPANY.format('empty')}",
+    ]
+
+def test_run_batch_resume_skips_finished_and_retries_failures(tmp_path):
+    checkpoint = tmp_path / 'batch.checkpoint'
+    urls = [COMPANY.format(name) for name in ('acme', 'empty', 'boom')]
+    batch.run_batch(iter(urls), FakeDatabase(), checkpoint_path=str(checkpoint))
+    
+    db = FakeDatabase()
+    stats = batch.run_batch(iter(urls), db, checkpoint_path=str(checkpoint))
+    
+    assert stats.companies_skipped == 2
+    assert stats.failures == 1
+    assert db.inserted == []
+
+def test_run_batch_does_not_checkpoint_failed_save(tmp_path):
+    checkpoint = tmp_path / 'batch.checkpoint'
+    
+    stats = batch.run_batch(iter([COMPANY.format('acme')]), FakeDatabase(saved=0),
+                            checkpoint_path=str(checkpoint))
+    
+    assert (stats.companies_done, stats.failures, stats.jobs) == (0, 1, 0)
+    assert read_checkpoint(checkpoint) == []
+
+def test_load_checkpoint_accepts_status_and_plain_lines(tmp_path):
+    checkpoint = tmp_path / 'batch.checkpoint'
+    checkpoint.write_text(
+        f"done\t{COMPANY.format('acme')}\nempty\t{COMPANY.format('empty')}\n"
+        f"{COMPANY.format('legacy')}\n\n",
+        encoding='utf-8'
+    )
+    
+    assert batch.load_checkpoint(str(checkpoint)) == {
+        COMPANY.format('acme'), COMPANY.format('empty'), COMPANY.format('legacy')
+    }
+
+def test_read_company_urls_skips_blanks_and_comments():
+    source = ['# companies\n', '\n', f"  {COMPANY.format('acme')}  \n"]
+    assert list(batch.read_company_urls(source)) == [COMPANY.format('acme')]
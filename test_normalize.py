@@ -0,0 +1,49 @@
+"""
+Tests for posted date and location normalization
+"""
+
+import pytest
+
+from normalize import parse_location, parse_posted_date
+
+SCRAPED_AT = '2024-03-01 12:00:00'
+
+@pytest.mark.parametrize('posted_date, expected', [
+    ('2024-01-05', '2024-01-05 00:00:00'),
+    ('2024-01-05T10:00:00Z', '2024-01-05 10:00:00'),
+    ('2 weeks ago', '2024-02-16 12:00:00'),
+    ('30+ days ago', '2024-01-31 12:00:00'),
+    ('Reposted 3 days ago', '2024-02-27 12:00:00'),
+    ('an hour ago', '2024-03-01 11:00:00'),
+    ('1 month ago', '2024-01-31 12:00:00'),
+    ('yesterday', '2024-02-29 12:00:00'),
+    ('Just now', '2024-03-01 12:00:00'),
+])
+def test_parse_posted_date(posted_date, expected):
+    assert parse_posted_date(posted_date, SCRAPED_AT) == expected
+
+@pytest.mark.parametrize('posted_date', ['', None, 'Actively recruiting'])
+def test_parse_posted_date_unparseable(posted_date):
+    assert parse_posted_date(posted_date, SCRAPED_AT) is None
+
+@pytest.mark.parametrize('job_location, city, region, country, is_remote', [
+    ('New York, NY', 'New York', 'New York', 'United States', 0),
+    ('San Francisco, CA', 'San Francisco', 'California', 'United States', 0),
+    ('Greater Seattle Area', 'Seattle', None, None, 0),
+    ('San Francisco Bay Area', 'San Francisco', None, None, 0),
+    ('United States (Remote)', None, None, 'United States', 1),
+    ('Remote - US', None, None, 'United States', 1),
+    ('Austin, TX (Remote)', 'Austin', 'Texas', 'United States', 1),
+    ('London, England, United Kingdom', 'London', 'England', 'United Kingdom', 0),
+    ('Toronto, Ontario, Canada (Hybrid)', 'Toronto', 'Ontario', 'Canada', 0),
+    ('Berlin, Germany', 'Berlin', None, 'Germany', 0),
+    ('Remote', None, None, None, 1),
+    ('Not specified', None, None, None, 0),
+])
+def test_parse_location(job_location, city, region, country, is_remote):
+    assert parse_location(job_location) == {
+        'city': city,
+        'region': region,
+        'country': country,
+        'is_remote': is_remote
+    }
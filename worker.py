@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Scrape worker for LinkedIn Job Scraper
+
+Runs scrapes queued by the web app in their own process, so scraping never
+competes with request handling. Progress is written to the database where
+every web worker can read it.
+"""
+
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+
+from database import JobDatabase
+from scraper import scrape_linkedin_jobs
+
+# Seconds between heartbeats while scraping; must stay well under
+# JobDatabase.RUNNING_STALE_SECONDS so a live scrape is never released
+HEARTBEAT_INTERVAL = 15
+
+def run_scrape(db, company_url):
+    """Scrape a company and record progress in the database"""
+    try:
+        db.update_scrape_status(progress='Initializing browser...')
+        
+        # Scrape jobs
+        jobs = scrape_linkedin_jobs(company_url)
+        
+        if jobs:
+            db.update_scrape_status(progress=f'Saving {len(jobs)} jobs to database...')
+            
+            # Save jobs to database
+            success_count = db.insert_jobs_batch(jobs)
+            
+            if success_count < len(jobs):
+                db.update_scrape_status(
+                    state='idle',
+                    progress='Saving jobs failed',
+                    jobs_found=0,
+                    error='Failed to save jobs to the database. Please try again.'
+                )
+            else:
+                db.update_scrape_status(
+                    state='idle',
+                    progress=f'Successfully scraped and saved {success_count} jobs!',
+                    jobs_found=success_count
+                )
+        else:
+            db.update_scrape_status(
+                state='idle',
+                progress='No jobs found or unable to scrape jobs',
+                jobs_found=0,
+                error='No jobs found. Please check the URL and try again.'
+            )
+    
+    except Exception as e:
+        db.update_scrape_status(
+            state='idle',
+            progress='Scraping failed',
+            jobs_found=0,
+            error=f'Error: {str(e)}'
+        )
+
+def run_scrape_with_heartbeat(db, company_url):
+    """Run a scrape while a background thread keeps its status fresh"""
+    stop = threading.Event()
+    
+    def heartbeat():
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            db.heartbeat_scrape()
+    
+    thread = threading.Thread(target=heartbeat, daemon=True)
+    thread.start()
+    try:
+        run_scrape(db, company_url)
+    finally:
+        stop.set()
+        thread.join()
+
+def run_worker(db_path='jobs.db', poll_interval=1.0):
+    """Poll the database for queued scrapes and run them one at a time"""
+    db = JobDatabase(db_path)
+    db.release_stale_scrape()
+    
+    # Only this process backfills, so web workers start without waiting on it
+    db.backfill_normalized_fields()
+    
+    while True:
+        company_url = db.claim_queued_scrape()
+        if company_url:
+            run_scrape_with_heartbeat(db, company_url)
+        else:
+            time.sleep(poll_interval)
+
+def start_worker_process(db_path='jobs.db'):
+    """Start the scrape worker in a separate process"""
+    process = multiprocessing.Process(target=run_worker, args=(db_path,), daemon=True)
+    process.start()
+    return process
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the LinkedIn job scrape worker')
+    parser.add_argument('--db', default=os.environ.get('JOBS_DB_PATH', 'jobs.db'),
+                        help='Path to the SQLite database')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='Seconds to wait between checks for queued scrapes')
+    args = parser.parse_args()
+    
+    print(f"🔧 Scrape worker watching {args.db}")
+    try:
+        run_worker(args.db, args.poll_interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Scrape worker stopped")
+
+if __name__ == "__main__":
+    main()